@@ -18,11 +18,17 @@ class Settings:
     
     # Your Node.js API Configuration
     nodejs_api_url = os.getenv("NODEJS_API_URL", "http://localhost:3000")
+    api_post_rate = float(os.getenv("API_POST_RATE", "5"))  # article POSTs per second
     
     # Scraping Configuration
     scraper_delay = float(os.getenv("SCRAPER_DELAY", "2.0"))
     scraper_timeout = int(os.getenv("SCRAPER_TIMEOUT", "30"))
     max_articles_per_source = int(os.getenv("MAX_ARTICLES_PER_SOURCE", "20"))
+    max_concurrent_sources = int(os.getenv("MAX_CONCURRENT_SOURCES", "5"))
+    connector_limit = int(os.getenv("CONNECTOR_LIMIT", "64"))  # total sockets per scrape session
+    connector_limit_per_host = int(os.getenv("CONNECTOR_LIMIT_PER_HOST", "4"))
+    max_page_bytes = int(os.getenv("MAX_PAGE_BYTES", str(5 * 1024 * 1024)))
+    playwright_profile_dir = os.getenv("PLAYWRIGHT_PROFILE_DIR", ".pw_profile")  # root; each browser claims a slot-N profile under it
     
     # Clustering Configuration
     similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.4"))
@@ -1,8 +1,12 @@
-import aiohttp
+import httpx
 import logging
+import orjson
+import time
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from app.config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 class APIClient:
@@ -10,18 +14,25 @@ class APIClient:
     
     def __init__(self, api_base_url: str):
         self.api_base_url = api_base_url
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[httpx.AsyncClient] = None
+        # Recent stories are fetched once per TTL window and kept current as we post
+        self._recent_stories_cache: Optional[List[Dict]] = None
+        self._recent_stories_ts = 0.0
+        self._recent_stories_ttl = settings.clustering_hours_back * 60
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
+        # Every call goes to the same API origin, so HTTP/2 multiplexes them over one connection
+        self.session = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=10.0),
             headers={'Content-Type': 'application/json'}
         )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
     
     async def post_article(self, article_data: Dict) -> bool:
         """Post scraped article to your Node.js API"""
@@ -38,14 +49,20 @@ class APIClient:
                 "is_primary_article": article_data.get("is_primary_article", False)
             }
             
-            async with self.session.post(f"{self.api_base_url}/api/rss", json=api_data) as response:
-                if response.status in [200, 201]:
-                    logger.info(f"Successfully posted article: {article_data.get('title', '')[:50]}...")
-                    return True
-                else:
-                    error_text = await response.text()
-                    logger.error(f"API error {response.status}: {error_text}")
-                    return False
+            response = await self.session.post(f"{self.api_base_url}/api/rss", json=api_data)
+            if response.status_code in [200, 201]:
+                logger.info(f"Successfully posted article: {article_data.get('title', '')[:50]}...")
+                if self._recent_stories_cache is not None and api_data["story_id"]:
+                    self._recent_stories_cache.append({
+                        "story_id": api_data["story_id"],
+                        "keywords": api_data["keywords"],
+                        "title": api_data["title"] or "",
+                        "category": api_data["category"]
+                    })
+                return True
+            else:
+                logger.error(f"API error {response.status_code}: {response.text}")
+                return False
                     
         except Exception as e:
             logger.error(f"Error posting article to API: {e}")
@@ -53,25 +70,32 @@ class APIClient:
     
     async def get_recent_stories(self, hours_back: int = 24) -> List[Dict]:
         """Get recent stories for clustering via your API"""
+        if (self._recent_stories_cache is not None
+                and time.monotonic() - self._recent_stories_ts < self._recent_stories_ttl):
+            return self._recent_stories_cache
+        
         try:
-            async with self.session.get(f"{self.api_base_url}/api/rss") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Filter articles that have story_id
-                    stories = []
-                    for article in data.get("data", []):
-                        if article.get("story_id"):
-                            stories.append({
-                                "story_id": article["story_id"],
-                                "keywords": article.get("keywords", []),
-                                "title": article.get("title", ""),
-                                "category": article.get("category", "general")
-                            })
-                    
-                    return stories
-                else:
-                    return []
+            response = await self.session.get(f"{self.api_base_url}/api/rss", follow_redirects=True)
+            if response.status_code == 200:
+                # The feed returns every stored article; orjson parses the raw body directly
+                data = orjson.loads(response.content)
+                
+                # Filter articles that have story_id
+                stories = []
+                for article in data.get("data", []):
+                    if article.get("story_id"):
+                        stories.append({
+                            "story_id": article["story_id"],
+                            "keywords": article.get("keywords", []),
+                            "title": article.get("title", ""),
+                            "category": article.get("category", "general")
+                        })
+                
+                self._recent_stories_cache = stories
+                self._recent_stories_ts = time.monotonic()
+                return stories
+            else:
+                return []
                     
         except Exception as e:
             logger.error(f"Error getting recent stories: {e}")
@@ -6,12 +6,11 @@ import os
 import sys
 import aiohttp
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 import uuid
 from app.router import ultra_scraper
 
-app.include_router(ultra_scraper.router)
-
 # Add project root to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -27,12 +26,27 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled session for the app lifetime so keep-alive connections and DNS lookups are reused
+    app.state.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=30)
+    )
+    try:
+        yield
+    finally:
+        await app.state.http_session.close()
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="Advanced news scraper for UAE with story clustering"
+    description="Advanced news scraper for UAE with story clustering",
+    lifespan=lifespan
 )
 
+app.include_router(ultra_scraper.router)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -75,21 +89,20 @@ async def health_check():
 async def test_api_connection():
     """Test connection to your Node.js API"""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{settings.nodejs_api_url}/health") as response:
-                if response.status == 200:
-                    return {
-                        "status": "success",
-                        "message": "Connected to Node.js API",
-                        "api_url": settings.nodejs_api_url,
-                        "api_status": response.status
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "message": f"Node.js API returned status {response.status}",
-                        "api_url": settings.nodejs_api_url
-                    }
+        async with app.state.http_session.get(f"{settings.nodejs_api_url}/health") as response:
+            if response.status == 200:
+                return {
+                    "status": "success",
+                    "message": "Connected to Node.js API",
+                    "api_url": settings.nodejs_api_url,
+                    "api_status": response.status
+                }
+            else:
+                return {
+                    "status": "error",
+                    "message": f"Node.js API returned status {response.status}",
+                    "api_url": settings.nodejs_api_url
+                }
     except Exception as e:
         return {
             "status": "error",
@@ -113,27 +126,26 @@ async def test_post_article():
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{settings.nodejs_api_url}/api/rss", 
-                json=sample_article,
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                if response.status in [200, 201]:
-                    result = await response.json()
-                    return {
-                        "status": "success",
-                        "message": "Successfully posted test article",
-                        "api_response": result,
-                        "article_data": sample_article
-                    }
-                else:
-                    error_text = await response.text()
-                    return {
-                        "status": "error",
-                        "message": f"Failed to post article: {response.status}",
-                        "error": error_text
-                    }
+        async with app.state.http_session.post(
+            f"{settings.nodejs_api_url}/api/rss", 
+            json=sample_article,
+            headers={'Content-Type': 'application/json'}
+        ) as response:
+            if response.status in [200, 201]:
+                result = await response.json()
+                return {
+                    "status": "success",
+                    "message": "Successfully posted test article",
+                    "api_response": result,
+                    "article_data": sample_article
+                }
+            else:
+                error_text = await response.text()
+                return {
+                    "status": "error",
+                    "message": f"Failed to post article: {response.status}",
+                    "error": error_text
+                }
     except Exception as e:
         return {
             "status": "error", 
@@ -166,28 +178,28 @@ async def test_scrape():
     posted_articles = []
     
     try:
-        async with aiohttp.ClientSession() as session:
-            for i, article in enumerate(test_articles):
-                try:
-                    async with session.post(
-                        f"{settings.nodejs_api_url}/api/rss",
-                        json=article,
-                        headers={'Content-Type': 'application/json'}
-                    ) as response:
-                        if response.status in [200, 201]:
-                            result = await response.json()
-                            posted_count += 1
-                            posted_articles.append({
-                                "title": article["title"],
-                                "id": result.get("data", {}).get("id", "unknown"),
-                                "category": article["category"]
-                            })
-                        else:
-                            error_text = await response.text()
-                            errors.append(f"Article {i+1} failed: Status {response.status} - {error_text}")
-                            
-                except Exception as e:
-                    errors.append(f"Article {i+1} error: {str(e)}")
+        session = app.state.http_session
+        for i, article in enumerate(test_articles):
+            try:
+                async with session.post(
+                    f"{settings.nodejs_api_url}/api/rss",
+                    json=article,
+                    headers={'Content-Type': 'application/json'}
+                ) as response:
+                    if response.status in [200, 201]:
+                        result = await response.json()
+                        posted_count += 1
+                        posted_articles.append({
+                            "title": article["title"],
+                            "id": result.get("data", {}).get("id", "unknown"),
+                            "category": article["category"]
+                        })
+                    else:
+                        error_text = await response.text()
+                        errors.append(f"Article {i+1} failed: Status {response.status} - {error_text}")
+                        
+            except Exception as e:
+                errors.append(f"Article {i+1} error: {str(e)}")
         
         return {
             "status": "success",
@@ -364,7 +376,7 @@ async def run_quick_fix_scraper():
         from app.scraper.run_quick_fix import quick_scraper
         
         logger.info("🚀 Starting QUICK-FIX UAE news scraper...")
-        result = await quick_scraper.run_quick_scrape()
+        result = await quick_scraper.run_quick_scrape(app.state.http_session)
         
         return {
             "status": "success",
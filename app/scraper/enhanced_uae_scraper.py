@@ -5,21 +5,36 @@ Enhanced UAE News Scraper with Detailed Logging and Error Handling
 
 import asyncio
 import aiohttp
+from aiolimiter import AsyncLimiter
 from bs4 import BeautifulSoup
+import soupsieve as sv
 import logging
 from datetime import datetime
-import uuid
 import re
+import sys
+import threading
 import time
-from typing import Dict, List, Set, Optional
+from typing import Dict, FrozenSet, List, Set, Optional
 from dataclasses import dataclass
-from urllib.parse import urljoin
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
 import json
+import xxhash
 
 from app.config.settings import settings
+from app.scraper.html_utils import decode_html
 
 logger = logging.getLogger(__name__)
 
+# Fallback selectors tried on every card, compiled once instead of per select_one call
+_ALT_HEADLINE_CSS = tuple(sv.compile(sel) for sel in ("h1", "h2", "h3", ".title", ".headline", "a"))
+_LINK_FALLBACK_CSS = sv.compile("a[href]")
+
+# Text cleaning patterns, compiled once for TextProcessor and clean_text.
+# A keyword is a run of 3+ word/Arabic characters; shorter runs never match.
+_RE_TOKEN = re.compile(r'[\w\u0600-\u06FF]{3,}')
+_RE_SHARE_ARTIFACTS = re.compile(r'(Share|Tweet|Email|Print|Read more|Continue reading).*$', re.IGNORECASE)
+
 @dataclass
 class ScrapingResult:
     """Detailed scraping result for each source"""
@@ -36,7 +51,7 @@ class ScrapingResult:
         if self.error_details is None:
             self.error_details = {}
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     headline: str
     url: str
@@ -48,6 +63,9 @@ class Article:
     scraped_at: datetime = None
     
     def __post_init__(self):
+        # Source and category come from a small fixed vocabulary; share one copy of each
+        self.source = sys.intern(self.source)
+        self.category = sys.intern(self.category)
         if self.keywords is None:
             self.keywords = set()
         if self.scraped_at is None:
@@ -454,39 +472,85 @@ class EnhancedUAENewsConfig:
         }
     }
 
+@dataclass(frozen=True, slots=True)
+class SourceSpec:
+    """Flattened source config with its CSS selectors compiled once"""
+    key: str
+    name: str
+    url: str
+    category: str
+    article_selector: str
+    headline_selector: str
+    link_selector: str
+    article_css: sv.SoupSieve
+    headline_css: sv.SoupSieve
+    link_css: sv.SoupSieve
+    summary_css: Optional[sv.SoupSieve]
+    # Optional subtree (e.g. "main, #content") the article search is scoped to
+    container_css: Optional[sv.SoupSieve] = None
+    
+    @classmethod
+    def from_config(cls, key: str, source_config: Dict) -> "SourceSpec":
+        selectors = source_config["selectors"]
+        summary_selector = selectors.get("summary", "")
+        container_selector = selectors.get("container", "")
+        return cls(
+            key=key,
+            name=source_config["name"],
+            url=source_config["url"],
+            category=source_config.get("category", "general"),
+            article_selector=selectors["articles"],
+            headline_selector=selectors["headline"],
+            link_selector=selectors["link"],
+            article_css=sv.compile(selectors["articles"]),
+            headline_css=sv.compile(selectors["headline"]),
+            link_css=sv.compile(selectors["link"]),
+            summary_css=sv.compile(summary_selector) if summary_selector else None,
+            container_css=sv.compile(container_selector) if container_selector else None,
+        )
+
+COMPILED_SOURCES: Dict[str, SourceSpec] = {
+    key: SourceSpec.from_config(key, config)
+    for key, config in EnhancedUAENewsConfig.SOURCES.items()
+}
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'news', 'report', 'said', 'says', 'new', 'first', 'latest', 'breaking',
+    'uae', 'dubai', 'abu', 'dhabi', 'emirates'
+})
+
+@lru_cache(maxsize=20000)
+def _extract_keywords_cached(text: str) -> FrozenSet[str]:
+    """Tokenize once per distinct text; front pages are re-polled, so the same headlines recur"""
+    # Single tokenizing pass; the pattern already enforces the 3-char minimum
+    return frozenset(
+        sys.intern(word) for word in _RE_TOKEN.findall(text.lower())
+        if word not in STOP_WORDS and not word.isdigit()
+    )
+
+@lru_cache(maxsize=None)
+def _card_image_extractor():
+    """Imported on first use so loading the base scraper never probes for Playwright"""
+    from app.scraper.image_extractor import EnhancedImageExtractor
+    return EnhancedImageExtractor
+
 class TextProcessor:
     """Enhanced text processing with better cleaning"""
     
     def __init__(self):
-        self.stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'news', 'report', 'said', 'says', 'new', 'first', 'latest', 'breaking',
-            'uae', 'dubai', 'abu', 'dhabi', 'emirates'
-        }
+        self.stop_words = STOP_WORDS
     
-    def extract_keywords(self, text: str) -> Set[str]:
+    def extract_keywords(self, text: str) -> FrozenSet[str]:
         """Extract keywords with enhanced cleaning"""
         if not text:
-            return set()
+            return frozenset()
         
         try:
-            # More aggressive cleaning
-            text = re.sub(r'[^\w\s\u0600-\u06FF]', ' ', text.lower())
-            text = re.sub(r'\s+', ' ', text).strip()
-            words = text.split()
-            
-            keywords = set()
-            for word in words:
-                if (len(word) >= 3 and 
-                    word not in self.stop_words and
-                    not word.isdigit() and
-                    not re.match(r'^[0-9]+$', word)):
-                    keywords.add(word)
-            
-            return keywords
+            return _extract_keywords_cached(text)
         except Exception as e:
             logger.warning(f"Error extracting keywords: {e}")
-            return set()
+            return frozenset()
 
 class EnhancedUAEScraper:
     """Enhanced scraper with detailed logging and error handling"""
@@ -494,8 +558,14 @@ class EnhancedUAEScraper:
     def __init__(self):
         self.text_processor = TextProcessor()
         self.api_base_url = settings.nodejs_api_url
-        self.scraped_urls = set()
-        self.last_request_time = 0
+        # 64-bit xxhash fingerprints of every article URL seen this process
+        self.scraped_url_hashes: Set[int] = set()
+        # Extraction runs in worker threads, so the seen-check and the insert must happen together
+        self._url_hash_lock = threading.Lock()
+        # Token bucket for article POSTs, shared by every caller of post_article_with_retry
+        self._post_limiter = AsyncLimiter(settings.api_post_rate, 1.0)
+        # Earliest time (monotonic) the next request to each host may start
+        self._host_next_time: Dict[str, float] = {}
         self.rate_limit_delay = max(settings.scraper_delay, 3.0)  # Minimum 3 seconds
         
         # Enhanced error tracking
@@ -561,23 +631,26 @@ class EnhancedUAEScraper:
             imgs = element.select('img')
             
             for img in imgs:
+                attrs = img.attrs
+                
                 # Skip placeholder SVGs (common in lazy loading)
-                src_val = img.get('src', '')
+                src_val = attrs.get('src', '')
                 if 'data:image/svg+xml' in src_val:
                     # This is a placeholder, look for lazy loading attributes
-                    logger.debug(f"Found lazy loading placeholder SVG, checking data attributes: {list(img.attrs.keys())}")
+                    logger.debug(f"Found lazy loading placeholder SVG, checking data attributes: {list(attrs)}")
                     continue
                 
                 # Prefer srcset highest quality
-                if img.has_attr('srcset') and img['srcset'] and not 'data:image/svg+xml' in img['srcset']:
-                    best = self._parse_srcset_best(img['srcset'], base_url)
+                srcset_val = attrs.get('srcset')
+                if srcset_val and not 'data:image/svg+xml' in srcset_val:
+                    best = self._parse_srcset_best(srcset_val, base_url)
                     if best and not 'data:image/svg+xml' in best:
                         return best
                 
                 # Enhanced attribute checking for lazy loading
                 # Priority order: data-lazy-src, data-src, data-original, src
-                for attr in ['data-lazy-src', 'data-src', 'data-original', 'data-lazy-srcset', 'src']:
-                    val = img.get(attr, '')
+                for attr in ('data-lazy-src', 'data-src', 'data-original', 'data-lazy-srcset', 'src'):
+                    val = attrs.get(attr, '')
                     if val and not 'data:image/svg+xml' in val:
                         # Handle srcset attributes
                         if 'srcset' in attr and ',' in val:
@@ -616,17 +689,19 @@ class EnhancedUAEScraper:
     async def fetch_article_content(self, article_url: str, session: aiohttp.ClientSession, timeout: int = 10) -> tuple[Optional[str], Optional[str]]:
         """Fetch article page and extract both image and text content."""
         try:
-            await self.respect_rate_limit()
+            await self.respect_rate_limit(article_url)
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
             }
             async with session.get(article_url, headers=headers, timeout=timeout) as response:
-                if response.status != 200:
+                if response.status != 200 or (response.content_length or 0) > settings.max_page_bytes:
                     return None, None
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                raw = await response.read()
+                html = decode_html(raw, response.charset)
+                soup = await asyncio.to_thread(BeautifulSoup, html, "lxml")
                 base_url = article_url
                 
                 # Extract image
@@ -733,10 +808,9 @@ class EnhancedUAEScraper:
             return None, None
         return None, None
     
-    async def respect_rate_limit(self):
-        """Enhanced rate limiting with exponential backoff"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    async def respect_rate_limit(self, url: str):
+        """Per-host rate limiting with exponential backoff; different hosts never wait on each other"""
+        host = urlparse(url).netloc
         
         delay = self.rate_limit_delay
         
@@ -745,16 +819,19 @@ class EnhancedUAEScraper:
             delay = delay * 2
             logger.warning(f"Rate limit hits detected, increasing delay to {delay}s")
         
-        if time_since_last < delay:
-            sleep_time = delay - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
+        # Reserve this host's next slot before sleeping so concurrent callers queue behind it
+        now = time.monotonic()
+        start_at = max(now, self._host_next_time.get(host, 0.0))
+        self._host_next_time[host] = start_at + delay
         
-        self.last_request_time = time.time()
+        if start_at > now:
+            sleep_time = start_at - now
+            logger.debug(f"Rate limiting {host}: sleeping for {sleep_time:.2f}s")
+            await asyncio.sleep(sleep_time)
     
     async def fetch_page_with_retry(self, url: str, source_name: str, session: aiohttp.ClientSession, timeout: int = 20) -> tuple[Optional[BeautifulSoup], Dict]:
         """Enhanced page fetching with retry logic and detailed error tracking"""
-        await self.respect_rate_limit()
+        await self.respect_rate_limit(url)
         
         error_details = {}
         headers = {
@@ -775,14 +852,22 @@ class EnhancedUAEScraper:
                     logger.info(f"📊 {source_name} - Status: {response.status}, Content-Type: {response.headers.get('content-type', 'unknown')}")
                     
                     if response.status == 200:
-                        html = await response.text()
+                        if (response.content_length or 0) > settings.max_page_bytes:
+                            error_details["page_too_large"] = f"Content-Length {response.content_length} exceeds {settings.max_page_bytes} bytes"
+                            logger.warning(f"⚠️ {source_name} - Skipping oversized page: {response.content_length} bytes")
+                            break
+                        
+                        # Decode ourselves so aiohttp never falls back to charset sniffing
+                        raw = await response.read()
+                        html = decode_html(raw, response.charset)
                         logger.info(f"📄 {source_name} - HTML length: {len(html)} chars")
                         
                         if len(html) < 1000:
                             error_details["html_too_short"] = f"HTML only {len(html)} chars"
                             logger.warning(f"⚠️ {source_name} - HTML suspiciously short: {len(html)} chars")
                         
-                        soup = BeautifulSoup(html, 'html.parser')
+                        # Parse in a worker thread so other sources keep fetching meanwhile
+                        soup = await asyncio.to_thread(BeautifulSoup, html, "lxml")
                         logger.info(f"✅ {source_name} - Successfully parsed HTML")
                         return soup, error_details
                         
@@ -833,21 +918,26 @@ class EnhancedUAEScraper:
         """Enhanced article extraction with detailed debugging"""
         articles = []
         debug_info = {}
-        selectors = source_config["selectors"]
         
         try:
-            # Test each selector and log results
-            article_selector = selectors["articles"]
-            headline_selector = selectors["headline"]
-            link_selector = selectors["link"]
+            # Configured sources are precompiled at import; ad-hoc configs are compiled here
+            spec = COMPILED_SOURCES.get(source_name)
+            if spec is None or spec.url != source_config["url"]:
+                spec = SourceSpec.from_config(source_name, source_config)
             
+            # Test each selector and log results
             logger.info(f"🔍 {source_name} - Testing selectors:")
-            logger.info(f"   Articles: '{article_selector}'")
-            logger.info(f"   Headlines: '{headline_selector}'")
-            logger.info(f"   Links: '{link_selector}'")
+            logger.info(f"   Articles: '{spec.article_selector}'")
+            logger.info(f"   Headlines: '{spec.headline_selector}'")
+            logger.info(f"   Links: '{spec.link_selector}'")
             
-            # Find article containers
-            article_elements = soup.select(article_selector)
+            headline_css = spec.headline_css
+            link_css = spec.link_css
+            summary_css = spec.summary_css
+            
+            # Find article containers, stopping once we have as many as we will process
+            search_root = (spec.container_css.select_one(soup) if spec.container_css else None) or soup
+            article_elements = spec.article_css.select(search_root, limit=settings.max_articles_per_source)
             debug_info["total_containers"] = len(article_elements)
             logger.info(f"📦 {source_name} - Found {len(article_elements)} article containers")
             
@@ -860,26 +950,26 @@ class EnhancedUAEScraper:
                 
                 logger.info(f"🔧 {source_name} - Trying alternative selectors...")
                 for alt_selector in alternative_selectors:
-                    alt_elements = soup.select(alt_selector)
+                    alt_elements = soup.select(alt_selector, limit=10)  # Use first 10
                     logger.info(f"   '{alt_selector}': {len(alt_elements)} elements")
                     if len(alt_elements) > 0:
-                        article_elements = alt_elements[:10]  # Use first 10
+                        article_elements = alt_elements
                         debug_info["used_alternative"] = alt_selector
                         break
             
             valid_articles = 0
             processing_errors = []
             
-            for i, element in enumerate(article_elements[:settings.max_articles_per_source]):
+            for i, element in enumerate(article_elements):
                 try:
                     logger.debug(f"🔍 {source_name} - Processing article {i+1}")
                     
                     # Extract headline with multiple attempts
-                    headline_elem = element.select_one(headline_selector)
+                    headline_elem = headline_css.select_one(element)
                     if not headline_elem:
                         # Try alternative headline selectors
-                        for alt_headline in ["h1", "h2", "h3", ".title", ".headline", "a"]:
-                            headline_elem = element.select_one(alt_headline)
+                        for alt_headline in _ALT_HEADLINE_CSS:
+                            headline_elem = alt_headline.select_one(element)
                             if headline_elem:
                                 break
                     
@@ -893,9 +983,9 @@ class EnhancedUAEScraper:
                         continue
                     
                     # Extract URL
-                    link_elem = element.select_one(link_selector)
+                    link_elem = link_css.select_one(element)
                     if not link_elem:
-                        link_elem = element.select_one("a[href]")  # Fallback
+                        link_elem = _LINK_FALLBACK_CSS.select_one(element)  # Fallback
                     
                     if not link_elem:
                         logger.debug(f"   ❌ No link found for article {i+1}")
@@ -907,21 +997,20 @@ class EnhancedUAEScraper:
                         continue
                     
                     # Make URL absolute
-                    if url.startswith('/'):
-                        base_url = source_config["url"]
-                        url = urljoin(base_url, url)
-                    elif not url.startswith('http'):
+                    if not url.startswith(('http://', 'https://', '/')):
                         logger.debug(f"   ❌ Invalid URL format: {url}")
                         continue
+                    if url[0] == '/':
+                        url = urljoin(spec.url, url)
                     
-                    # Skip if already processed
-                    if url in self.scraped_urls:
+                    # Skip if already processed (or claimed by a source extracting concurrently)
+                    if not self.claim_url(url):
                         logger.debug(f"   ⚠️ Duplicate URL: {url}")
                         continue
                     
                     # Extract summary
                     summary = ""
-                    summary_elem = element.select_one(selectors.get("summary", ""))
+                    summary_elem = summary_css.select_one(element) if summary_css else None
                     if summary_elem:
                         summary = self.clean_text(summary_elem.get_text(strip=True))
                     
@@ -929,22 +1018,25 @@ class EnhancedUAEScraper:
                     text_for_keywords = f"{headline} {summary}"
                     keywords = self.text_processor.extract_keywords(text_for_keywords)
                     
-                    # Try to get image from the card first
-                    image_url = self.extract_image_from_element(element, source_config["url"]) or None
+                    # Try the lazy-loading aware card extractor first, then the built-in fallback
+                    image_url = (
+                        _card_image_extractor().extract_image_from_element(element, spec.url)
+                        or self.extract_image_from_element(element, spec.url)
+                        or None
+                    )
 
                     # Create article
                     article = Article(
                         headline=headline,
                         url=url,
-                        source=source_config["name"],
+                        source=spec.name,
                         summary=summary,
-                        category=source_config.get("category", "general"),
+                        category=spec.category,
                         keywords=keywords,
                         image_url=image_url
                     )
                     
                     articles.append(article)
-                    self.scraped_urls.add(url)
                     valid_articles += 1
                     
                     logger.debug(f"   ✅ Valid article: {headline[:50]}...")
@@ -959,7 +1051,7 @@ class EnhancedUAEScraper:
             debug_info.update({
                 "valid_articles": valid_articles,
                 "processing_errors": processing_errors,
-                "selectors_used": selectors
+                "selectors_used": source_config["selectors"]
             })
             
             logger.info(f"✅ {source_name} - Extracted {valid_articles} valid articles")
@@ -972,21 +1064,26 @@ class EnhancedUAEScraper:
         
         return articles, debug_info
     
+    def claim_url(self, url: str) -> bool:
+        """Mark a URL as seen; False if it already was. Safe to call from worker threads."""
+        url_hash = xxhash.xxh64_intdigest(url.encode())
+        with self._url_hash_lock:
+            if url_hash in self.scraped_url_hashes:
+                return False
+            self.scraped_url_hashes.add(url_hash)
+            return True
+    
     def clean_text(self, text: str) -> str:
         """Enhanced text cleaning"""
         if not text:
             return ""
         
         try:
-            # Remove extra whitespace and normalize
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            # Remove common artifacts
-            text = re.sub(r'\n+', ' ', text)
-            text = re.sub(r'\t+', ' ', text)
+            # Collapse all whitespace runs (newlines and tabs included) and trim in one pass
+            text = ' '.join(text.split())
             
             # Remove common website artifacts
-            text = re.sub(r'(Share|Tweet|Email|Print|Read more|Continue reading).*$', '', text, flags=re.IGNORECASE)
+            text = _RE_SHARE_ARTIFACTS.sub('', text)
             
             return text[:500]  # Limit length
         except Exception as e:
@@ -1026,8 +1123,8 @@ class EnhancedUAEScraper:
                     "image_url": article.image_url or None
                 }
                 
-                # Add extra delay between API calls
-                await asyncio.sleep(1.0)
+                # Shared token bucket: concurrent sources (and the ultra scraper) together stay under the API rate
+                await self._post_limiter.acquire()
                 
                 async with session.post(
                     f"{self.api_base_url}/api/rss",
@@ -1131,11 +1228,14 @@ class EnhancedUAEScraper:
                         for it in mcp_items:
                             try:
                                 url = it.get('link', '')
-                                if not url or url in self.scraped_urls:
+                                if not url:
+                                    continue
+                                url = self._make_absolute(url, source_config["url"])
+                                if not self.claim_url(url):
                                     continue
                                 article = Article(
                                     headline=self.clean_text(it.get('headline', '')),
-                                    url=self._make_absolute(url, source_config["url"]),
+                                    url=url,
                                     source=source_config["name"],
                                     summary=self.clean_text(it.get('summary', '')),
                                     category=source_config.get("category", "general"),
@@ -1143,7 +1243,6 @@ class EnhancedUAEScraper:
                                     image_url=it.get('image_url') or None
                                 )
                                 articles.append(article)
-                                self.scraped_urls.add(article.url)
                             except Exception as e:
                                 logger.warning(f"⚠️ MCP item conversion error: {e}")
                         result.articles_found = len(articles)
@@ -1172,9 +1271,6 @@ class EnhancedUAEScraper:
                     posted_count += 1
                 else:
                     posting_errors.append(f"Article {i+1}: {post_errors}")
-                
-                # Small delay between posts
-                await asyncio.sleep(0.5)
             
             result.articles_posted = posted_count
             result.error_details["posting_errors"] = posting_errors
@@ -1211,37 +1307,22 @@ class EnhancedUAEScraper:
             "rate_limit_hits": 0
         }
         
-        results = []
-        total_found = 0
-        total_posted = 0
-        
         # Sort sources by priority
         sorted_sources = sorted(
             EnhancedUAENewsConfig.SOURCES.items(),
             key=lambda x: x[1].get('priority', 999)
         )
         
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(limit=5, limit_per_host=2),
-            timeout=aiohttp.ClientTimeout(total=60)
-        ) as session:
-            
-            for source_name, source_config in sorted_sources:
+        # Sources run concurrently; politeness is enforced per host by respect_rate_limit
+        source_semaphore = asyncio.Semaphore(settings.max_concurrent_sources)
+        
+        async def scrape_one(source_name: str, source_config: Dict, session: aiohttp.ClientSession) -> ScrapingResult:
+            async with source_semaphore:
                 try:
-                    result = await self.scrape_source_enhanced(source_name, source_config, session)
-                    results.append(result)
-                    total_found += result.articles_found
-                    total_posted += result.articles_posted
-                    
-                    # Adaptive delay based on success
-                    if result.status == 'success':
-                        await asyncio.sleep(2)
-                    else:
-                        await asyncio.sleep(5)  # Longer delay after failures
-                        
+                    return await self.scrape_source_enhanced(source_name, source_config, session)
                 except Exception as e:
                     logger.error(f"❌ Critical error scraping {source_name}: {e}")
-                    error_result = ScrapingResult(
+                    return ScrapingResult(
                         source_name=source_config['name'],
                         url=source_config['url'],
                         status='failed',
@@ -1249,7 +1330,18 @@ class EnhancedUAEScraper:
                         articles_posted=0,
                         error_details={"critical_error": str(e)}
                     )
-                    results.append(error_result)
+        
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=5, limit_per_host=2),
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as session:
+            results = await asyncio.gather(*(
+                scrape_one(source_name, source_config, session)
+                for source_name, source_config in sorted_sources
+            ))
+        
+        total_found = sum(r.articles_found for r in results)
+        total_posted = sum(r.articles_posted for r in results)
         
         elapsed_time = time.time() - start_time
         
@@ -1496,17 +1588,19 @@ async def fetch_article_content(self, article_url: str, session: aiohttp.ClientS
     Enhanced version that handles lazy loading images in article pages
     """
     try:
-        await self.respect_rate_limit()
+        await self.respect_rate_limit(article_url)
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
         }
         async with session.get(article_url, headers=headers, timeout=timeout) as response:
-            if response.status != 200:
+            if response.status != 200 or (response.content_length or 0) > settings.max_page_bytes:
                 return None, None
-            html = await response.text()
-            soup = BeautifulSoup(html, 'html.parser')
+            raw = await response.read()
+            html = decode_html(raw, response.charset)
+            soup = await asyncio.to_thread(BeautifulSoup, html, "lxml")
             base_url = article_url
             
             # Extract image with enhanced lazy loading support
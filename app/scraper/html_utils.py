@@ -0,0 +1,21 @@
+# app/scraper/html_utils.py
+"""
+Parsing helpers shared by the scrapers
+"""
+
+from typing import Optional
+
+
+def decode_html(raw: bytes, charset: Optional[str]) -> str:
+    """Decode a fetched body once, trusting the declared charset and defaulting to UTF-8"""
+    try:
+        return raw.decode(charset or 'utf-8', errors='replace')
+    except LookupError:
+        # Unknown or misspelled charset names (e.g. "utf8mb4"); errors='replace' does not cover these
+        return raw.decode('utf-8', errors='replace')
+
+
+def node_text(node) -> str:
+    """Text of a node; reads a lone text child directly instead of walking descendants"""
+    s = node.string
+    return s.strip() if s else node.get_text(' ', strip=True)
@@ -10,8 +10,32 @@ from urllib.parse import urljoin
 import re
 import json
 
+try:
+    from playwright.async_api import async_playwright
+    _HAS_PW = True
+except ImportError:
+    async_playwright = None
+    _HAS_PW = False
+
 logger = logging.getLogger(__name__)
 
+# Lazy-loading attributes in priority order
+_LAZY_IMG_ATTRS = (
+    'data-src',           # Most common
+    'data-lazy-src',      # Alternative
+    'data-original',      # jQuery lazy load
+    'data-srcset',        # Responsive images
+    'data-lazy-srcset',   # Lazy responsive
+    'data-echo',          # Echo.js
+    'data-unveil',        # Unveil.js
+    'data-image',         # Generic
+    'data-img',           # Generic short
+    'data-url',           # Generic URL
+    'data-hi-res-src',    # High resolution
+    'data-low-src',       # Low quality placeholder
+    'data-thumb',         # Thumbnail that might have full URL
+)
+
 class EnhancedImageExtractor:
     """
     Handles all types of lazy loading techniques including:
@@ -55,65 +79,42 @@ class EnhancedImageExtractor:
         imgs = element.select('img')
         
         for img in imgs:
-            # Check all possible lazy loading attributes in priority order
-            lazy_attrs = [
-                'data-src',           # Most common
-                'data-lazy-src',      # Alternative
-                'data-original',      # jQuery lazy load
-                'data-srcset',        # Responsive images
-                'data-lazy-srcset',   # Lazy responsive
-                'data-echo',          # Echo.js
-                'data-unveil',        # Unveil.js
-                'data-image',         # Generic
-                'data-img',           # Generic short
-                'data-url',           # Generic URL
-                'data-hi-res-src',    # High resolution
-                'data-low-src',       # Low quality placeholder
-                'data-thumb',         # Thumbnail that might have full URL
-            ]
+            # One dict lookup per attribute instead of has_attr() followed by indexing
+            attrs = img.attrs
             
             # First, check lazy loading attributes
-            for attr in lazy_attrs:
-                if img.has_attr(attr):
-                    url = img[attr]
-                    if url and not is_placeholder(url):
-                        # Handle srcset format
-                        if ',' in url and ('w' in url or 'x' in url):
-                            # Parse srcset and get highest resolution
-                            parts = url.split(',')
-                            best_url = parts[-1].strip().split(' ')[0]
-                            return make_absolute(best_url)
-                        return make_absolute(url)
+            for attr in _LAZY_IMG_ATTRS:
+                url = attrs.get(attr)
+                if url and not is_placeholder(url):
+                    # Handle srcset format
+                    if ',' in url and ('w' in url or 'x' in url):
+                        # Parse srcset and get highest resolution
+                        parts = url.split(',')
+                        best_url = parts[-1].strip().split(' ')[0]
+                        return make_absolute(best_url)
+                    return make_absolute(url)
             
             # Strategy 2: Check if src is NOT a placeholder
-            if img.has_attr('src'):
-                src = img['src']
-                if src and not is_placeholder(src):
-                    return make_absolute(src)
+            src = attrs.get('src')
+            if src and not is_placeholder(src):
+                return make_absolute(src)
             
             # Strategy 3: Check srcset (even if src is placeholder)
-            if img.has_attr('srcset'):
-                srcset = img['srcset']
-                if srcset and not is_placeholder(srcset):
-                    # Parse srcset and get highest resolution
-                    parts = srcset.split(',')
-                    best_url = parts[-1].strip().split(' ')[0]
-                    if not is_placeholder(best_url):
-                        return make_absolute(best_url)
+            srcset = attrs.get('srcset')
+            if srcset and not is_placeholder(srcset):
+                # Parse srcset and get highest resolution
+                parts = srcset.split(',')
+                best_url = parts[-1].strip().split(' ')[0]
+                if not is_placeholder(best_url):
+                    return make_absolute(best_url)
         
         # Strategy 4: Look in picture/source elements
         picture = element.find('picture')
         if picture:
             sources = picture.find_all('source')
             for source in sources:
-                if source.has_attr('srcset'):
-                    srcset = source['srcset']
-                    if srcset and not is_placeholder(srcset):
-                        parts = srcset.split(',')
-                        best_url = parts[-1].strip().split(' ')[0]
-                        return make_absolute(best_url)
-                if source.has_attr('data-srcset'):
-                    srcset = source['data-srcset']
+                for attr in ('srcset', 'data-srcset'):
+                    srcset = source.attrs.get(attr)
                     if srcset and not is_placeholder(srcset):
                         parts = srcset.split(',')
                         best_url = parts[-1].strip().split(' ')[0]
@@ -130,11 +131,10 @@ class EnhancedImageExtractor:
         
         # Strategy 6: Check data attributes with full URLs
         for elem in element.select('[data-bg], [data-background-image]'):
-            for attr in ['data-bg', 'data-background-image']:
-                if elem.has_attr(attr):
-                    url = elem[attr]
-                    if url and not is_placeholder(url):
-                        return make_absolute(url)
+            for attr in ('data-bg', 'data-background-image'):
+                url = elem.attrs.get(attr)
+                if url and not is_placeholder(url):
+                    return make_absolute(url)
         
         return None
     
@@ -143,10 +143,10 @@ class EnhancedImageExtractor:
         """
         Use Playwright to execute JavaScript and get real images
         """
+        if not _HAS_PW:
+            return []
+        
         try:
-            from playwright.async_api import async_playwright
-            import asyncio
-            
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
                 page = await browser.new_page()
@@ -225,35 +225,6 @@ class EnhancedImageExtractor:
             return []
 
 
-def apply_image_extraction_fix():
-    """
-    Apply the image extraction fix to your existing scraper
-    """
-    from app.scraper.enhanced_uae_scraper import EnhancedUAEScraper
-    
-    # Replace the image extraction method
-    original_method = EnhancedUAEScraper.extract_image_from_element
-    
-    def fixed_extract_image(self, element, base_url: str) -> Optional[str]:
-        """Fixed image extraction that handles lazy loading"""
-        # Try enhanced extraction first
-        result = EnhancedImageExtractor.extract_image_from_element(element, base_url)
-        
-        if result and 'data:image/svg' not in result:
-            logger.debug(f"✅ Extracted real image: {result[:50]}...")
-            return result
-        
-        # Fallback to original method if needed
-        logger.debug("⚠️ No real image found, SVG placeholder detected")
-        return None
-    
-    # Monkey patch the method
-    EnhancedUAEScraper.extract_image_from_element = fixed_extract_image
-    
-    logger.info("✅ Image extraction fix applied!")
-    return True
-
-
 # Special handling for TimeOut and Construction Week
 class SpecialSiteHandlers:
     """
@@ -265,7 +236,8 @@ class SpecialSiteHandlers:
         """
         Special handler for TimeOut Dubai
         """
-        from playwright.async_api import async_playwright
+        if not _HAS_PW:
+            return []
         
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
@@ -311,7 +283,8 @@ class SpecialSiteHandlers:
         """
         Special handler for Construction Week
         """
-        from playwright.async_api import async_playwright
+        if not _HAS_PW:
+            return []
         
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
@@ -371,10 +344,3 @@ class SpecialSiteHandlers:
             await browser.close()
             return articles
 
-
-# Auto-apply the fix
-try:
-    apply_image_extraction_fix()
-    logger.info("🖼️ Image extraction fix has been applied!")
-except Exception as e:
-    logger.error(f"Failed to apply image fix: {e}")
\ No newline at end of file
@@ -1,8 +1,123 @@
+import json
 import logging
 from typing import Dict, List, Tuple
 
+# MCP tools are only available inside an MCP environment; probe once at import
+try:
+    from mcp_playwright import playwright_navigate, playwright_evaluate
+except ImportError:
+    playwright_navigate = playwright_evaluate = None
+
 logger = logging.getLogger(__name__)
 
+# Extraction script evaluated in the page. Kept static so only the small
+# params object changes per call and V8 can reuse the compiled function.
+_EXTRACT_JS_TMPL = """(params) => {
+    const start = Date.now();
+    const maxItems = params.maxItems;
+
+    // Enhanced selectors for article containers
+    const articleSelectors = [
+        params.articleSelector,
+        'article',
+        '[class*="card" i]',
+        '[class*="Card" i]',
+        '[class*="story" i]',
+        '[class*="post" i]',
+        '.news-item',
+        '.article-item'
+    ].filter(s => s);
+
+    // Helper functions
+    const getText = (el, sel) => {
+        if (!el) return '';
+        const found = sel ? el.querySelector(sel) : el;
+        return found ? found.textContent.trim().replace(/\\s+/g, ' ').slice(0, 200) : '';
+    };
+
+    const getLink = (el) => {
+        const a = el.querySelector('a[href]');
+        return a ? a.href : '';
+    };
+
+    const getImage = (el) => {
+        const imgs = el.querySelectorAll('img');
+        for (const img of imgs) {
+            // Skip SVG placeholders (TimeOut, Construction Week issue)
+            const src = img.src || '';
+            if (src && !src.includes('data:image/svg+xml') && !src.includes('placeholder')) {
+                return src;
+            }
+
+            // Check lazy loading attributes
+            for (const attr of ['data-src', 'data-lazy-src', 'data-original']) {
+                const val = img.getAttribute(attr);
+                if (val && !val.includes('data:image/svg+xml')) {
+                    return val;
+                }
+            }
+        }
+        return null;
+    };
+
+    // Find containers using progressive selector testing
+    let containers = [];
+    let usedSelector = '';
+
+    for (const selector of articleSelectors) {
+        try {
+            const found = Array.from(document.querySelectorAll(selector));
+            if (found.length > 0) {
+                containers = found;
+                usedSelector = selector;
+                break;
+            }
+        } catch (e) {
+            // Skip invalid selectors
+        }
+    }
+
+    // Wait for lazy loading (scroll to trigger)
+    window.scrollBy(0, 1000);
+
+    // Extract items
+    const items = containers.slice(0, maxItems).map(el => {
+        try {
+            const headline = getText(el, 'h1, h2, h3, [class*="title" i], [class*="headline" i], a');
+            const link = getLink(el);
+            const summary = getText(el, 'p, [class*="summary" i], [class*="excerpt" i]');
+            const image_url = getImage(el);
+
+            if (!headline || !link || headline.length < 10) {
+                return null;
+            }
+
+            return {
+                headline: headline,
+                link: link,
+                summary: summary,
+                image_url: image_url
+            };
+        } catch (e) {
+            return null;
+        }
+    }).filter(item => item !== null);
+
+    const elapsed = Date.now() - start;
+
+    return {
+        items: items,
+        diag: {
+            url: location.href,
+            found_containers: containers.length,
+            used_selector: usedSelector,
+            extracted_items: items.length,
+            elapsed_ms: elapsed
+        }
+    };
+}
+"""
+
 
 async def extract_with_mcp_direct(
     page_url: str,
@@ -17,10 +132,11 @@ async def extract_with_mcp_direct(
     
     Returns: (items, diag)
     """
+    if playwright_navigate is None:
+        logger.error("🧭 MCP tools not available - install mcp_playwright package")
+        return [], {"error": "mcp_import_error", "details": "MCP playwright tools not available"}
+    
     try:
-        # Import MCP tools - these should be available in your MCP environment
-        from mcp_playwright import playwright_navigate, playwright_evaluate
-        
         logger.info(f"🧭 MCP: Navigating to {page_url}")
         
         # Navigate to the page
@@ -36,113 +152,12 @@ async def extract_with_mcp_direct(
         
         logger.info(f"🧭 MCP: Navigation result: {nav_result}")
         
-        # Build extraction script
-        extraction_script = f"""
-        (() => {{
-            const start = Date.now();
-            const maxItems = {max_items};
-            
-            // Enhanced selectors for article containers
-            const articleSelectors = [
-                '{selectors.get("articles", "")}',
-                'article',
-                '[class*="card" i]',
-                '[class*="Card" i]',
-                '[class*="story" i]',
-                '[class*="post" i]',
-                '.news-item',
-                '.article-item'
-            ].filter(s => s);
-            
-            // Helper functions
-            const getText = (el, sel) => {{
-                if (!el) return '';
-                const found = sel ? el.querySelector(sel) : el;
-                return found ? found.textContent.trim().replace(/\\s+/g, ' ').slice(0, 200) : '';
-            }};
-            
-            const getLink = (el) => {{
-                const a = el.querySelector('a[href]');
-                return a ? a.href : '';
-            }};
-            
-            const getImage = (el) => {{
-                const imgs = el.querySelectorAll('img');
-                for (const img of imgs) {{
-                    // Skip SVG placeholders (TimeOut, Construction Week issue)
-                    const src = img.src || '';
-                    if (src && !src.includes('data:image/svg+xml') && !src.includes('placeholder')) {{
-                        return src;
-                    }}
-                    
-                    // Check lazy loading attributes
-                    for (const attr of ['data-src', 'data-lazy-src', 'data-original']) {{
-                        const val = img.getAttribute(attr);
-                        if (val && !val.includes('data:image/svg+xml')) {{
-                            return val;
-                        }}
-                    }}
-                }}
-                return null;
-            }};
-            
-            // Find containers using progressive selector testing
-            let containers = [];
-            let usedSelector = '';
-            
-            for (const selector of articleSelectors) {{
-                try {{
-                    const found = Array.from(document.querySelectorAll(selector));
-                    if (found.length > 0) {{
-                        containers = found;
-                        usedSelector = selector;
-                        break;
-                    }}
-                }} catch (e) {{
-                    // Skip invalid selectors
-                }}
-            }}
-            
-            // Wait for lazy loading (scroll to trigger)
-            window.scrollBy(0, 1000);
-            
-            // Extract items
-            const items = containers.slice(0, maxItems).map(el => {{
-                try {{
-                    const headline = getText(el, 'h1, h2, h3, [class*="title" i], [class*="headline" i], a');
-                    const link = getLink(el);
-                    const summary = getText(el, 'p, [class*="summary" i], [class*="excerpt" i]');
-                    const image_url = getImage(el);
-                    
-                    if (!headline || !link || headline.length < 10) {{
-                        return null;
-                    }}
-                    
-                    return {{
-                        headline: headline,
-                        link: link,
-                        summary: summary,
-                        image_url: image_url
-                    }};
-                }} catch (e) {{
-                    return null;
-                }}
-            }}).filter(item => item !== null);
-            
-            const elapsed = Date.now() - start;
-            
-            return {{
-                items: items,
-                diag: {{
-                    url: location.href,
-                    found_containers: containers.length,
-                    used_selector: usedSelector,
-                    extracted_items: items.length,
-                    elapsed_ms: elapsed
-                }}
-            }};
-        }})()
-        """
+        # Only the params are encoded per call; the script body is a module constant
+        params = {
+            "maxItems": max_items,
+            "articleSelector": selectors.get("articles", ""),
+        }
+        extraction_script = f"({_EXTRACT_JS_TMPL})({json.dumps(params)})"
         
         logger.info(f"🧭 MCP: Executing extraction script")
         
@@ -159,10 +174,6 @@ async def extract_with_mcp_direct(
         
         return items, diag
         
-    except ImportError:
-        logger.error("🧭 MCP tools not available - install mcp_playwright package")
-        return [], {"error": "mcp_import_error", "details": "MCP playwright tools not available"}
-    
     except Exception as e:
         logger.error(f"🧭 MCP extraction error: {e}")
         return [], {"error": "mcp_exception", "details": str(e)}
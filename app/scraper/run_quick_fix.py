@@ -5,24 +5,96 @@ Quick-Fix UAE Scraper - Only working sources with longer delays
 
 import asyncio
 import aiohttp
+from aiolimiter import AsyncLimiter
 from bs4 import BeautifulSoup
+import soupsieve as sv
+from rbloom import Bloom
 import logging
-from datetime import datetime
-import uuid
+import orjson
+from datetime import datetime, timezone
 import re
 import time
-from typing import Dict, List, Set, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Set, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 
 from app.config.settings import settings
+from app.scraper.html_utils import node_text
 
 logger = logging.getLogger(__name__)
 
+# Returned by fetch_page when the server answers 304 to a conditional request
+NOT_MODIFIED = object()
+
+# (ETag, Last-Modified) response validators
+Validators = Tuple[Optional[str], Optional[str]]
+
+@lru_cache(maxsize=None)
+def _compile_selector(selector: str) -> sv.SoupSieve:
+    """Compile a CSS selector once per process instead of on every select call"""
+    return sv.compile(selector)
+
+def _split_selector_list(selector: str) -> List[str]:
+    """Split a selector list on its top-level commas only; commas inside :is(...), [attr="a,b"] etc. stay put"""
+    parts, start, depth, quote, escaped = [], 0, 0, None, False
+    for i, ch in enumerate(selector):
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(selector[start:i])
+            start = i + 1
+    parts.append(selector[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+@lru_cache(maxsize=None)
+def _compile_alternatives(selector: str) -> Tuple[sv.SoupSieve, ...]:
+    """Split a "h2, h3, .title" list into separately compiled selectors, tried in the listed order"""
+    return tuple(_compile_selector(part) for part in _split_selector_list(selector))
+
+def _select_first(alternatives: Tuple[sv.SoupSieve, ...], element):
+    """First match of the highest-priority alternative that hits"""
+    for css in alternatives:
+        hit = css.select_one(element)
+        if hit is not None:
+            return hit
+    return None
+
+def _parse_page_static(html: str, source_name: str, source_config: Dict) -> List[Dict]:
+    """Parse a listing page and extract its cards (CPU-bound, runs in a worker thread)"""
+    return QuickFixScraper.extract_articles(BeautifulSoup(html, "lxml"), source_name, source_config)
+
 class QuickFixScraper:
     """Quick fix scraper focusing on working sources only"""
     
+    # Text cleanup patterns and stop words, built once rather than per article
+    _NONWORD = re.compile(r'[^\w\s]')
+    _WS = re.compile(r'\s+')
+    _STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'news', 'said', 'says'})
+    
     def __init__(self):
         self.api_base_url = settings.nodejs_api_url
-        self.scraped_urls = set()
+        # Fixed-size seen-URL filter (~1.2 MB for 1M URLs at 1% false positives) instead of an ever-growing set
+        self.scraped_urls = Bloom(1_000_000, 0.01)
+        # Links handed to post_article but not yet accepted by the API
+        self._claimed_urls: Set[str] = set()
+        # One in-flight fetch per host; different hosts scrape in parallel
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        # Token bucket shared by every concurrent source so the API sees a steady post rate
+        self._post_limiter = AsyncLimiter(settings.api_post_rate, 1.0)
+        # url -> (ETag, Last-Modified) from the last 200, replayed as conditional request headers
+        self._etag_cache: Dict[str, Validators] = {}
         
         # ONLY WORKING SOURCES - based on your logs
         self.working_sources = {
@@ -84,109 +156,125 @@ class QuickFixScraper:
         }
     
     def extract_keywords(self, text: str) -> List[str]:
-        """Simple keyword extraction"""
+        """Simple keyword extraction, most frequent first"""
         if not text:
             return []
         
-        # Clean text
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = text.split()
-        
-        # Filter keywords
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'news', 'said', 'says'}
-        keywords = [word for word in words if len(word) >= 3 and word not in stop_words and not word.isdigit()]
+        # Clean, filter and count in one pass; a leading letter rules out numbers without scanning the word
+        stop_words = self._STOP_WORDS
+        counts = Counter(
+            word for word in self._NONWORD.sub(' ', text.lower()).split()
+            if len(word) >= 3 and word[0].isalpha() and word not in stop_words
+        )
         
-        return keywords[:10]  # Limit to 10 keywords
+        return [word for word, _ in counts.most_common(10)]  # Limit to 10 keywords
     
-    def clean_text(self, text: str) -> str:
+    @classmethod
+    def clean_text(cls, text: str) -> str:
         """Clean text"""
         if not text:
             return ""
-        return re.sub(r'\s+', ' ', text).strip()[:500]
+        return cls._WS.sub(' ', text).strip()[:500]
     
-    async def fetch_page(self, url: str, source_name: str, session: aiohttp.ClientSession) -> Optional[BeautifulSoup]:
-        """Fetch page with better headers"""
+    async def fetch_page(self, url: str, source_name: str, session: aiohttp.ClientSession) -> Tuple[Optional[str], Optional[Validators]]:
+        """Fetch page with better headers; html is NOT_MODIFIED when the page is unchanged since last fetch.
+        
+        The response validators are returned rather than cached so the caller can store them
+        only once the page has been scraped successfully.
+        """
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',  # Removed brotli
+            'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive'
         }
+        etag, last_modified = self._etag_cache.get(url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
         
         try:
             logger.info(f"🌐 Fetching {source_name}: {url}")
             async with session.get(url, headers=headers, timeout=20) as response:
-                if response.status == 200:
+                if response.status == 304:
+                    logger.info(f"💤 {source_name} - Not modified since last fetch")
+                    return NOT_MODIFIED, None
+                elif response.status == 200:
                     html = await response.text()
                     logger.info(f"✅ {source_name} - Got {len(html)} chars")
-                    return BeautifulSoup(html, 'html.parser')
+                    validators = None
+                    if 'ETag' in response.headers or 'Last-Modified' in response.headers:
+                        validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                    return html, validators
                 else:
                     logger.warning(f"❌ {source_name} - Status {response.status}")
-                    return None
+                    return None, None
         except Exception as e:
             logger.error(f"❌ {source_name} - Error: {e}")
-            return None
+            return None, None
     
-    def extract_articles(self, soup: BeautifulSoup, source_name: str, selectors: Dict) -> List[Dict]:
-        """Extract articles from page"""
+    @classmethod
+    def extract_articles(cls, soup: BeautifulSoup, source_name: str, source_config: Dict) -> List[Dict]:
+        """Extract articles from page; stateless so it can run off the event loop"""
         articles = []
+        selectors = source_config["selectors"]
+        
+        headline_alts = _compile_alternatives(selectors["headline"])
+        link_alts = _compile_alternatives(selectors["link"])
+        summary_alts = _compile_alternatives(selectors.get("summary", "p"))
+        img_css = _compile_selector("img")
+        
+        # Every card on the page was scraped at the same moment
+        timestamp = datetime.now(timezone.utc).isoformat()
         
         try:
-            # Find articles
-            article_elements = soup.select(selectors["articles"])
+            # Find articles, stopping the tree walk once we have as many as we keep
+            article_elements = _compile_selector(selectors["articles"]).select(soup, limit=20)  # Limit to 20 per source
             logger.info(f"📦 {source_name} - Found {len(article_elements)} containers")
             
-            for element in article_elements[:20]:  # Limit to 20 per source
+            for element in article_elements:
                 try:
                     # Get headline
-                    headline_elem = element.select_one(selectors["headline"])
+                    headline_elem = _select_first(headline_alts, element)
                     if not headline_elem:
                         continue
                     
-                    headline = self.clean_text(headline_elem.get_text(strip=True))
+                    headline = cls.clean_text(node_text(headline_elem))
                     if not headline or len(headline) < 10:
                         continue
                     
                     # Get link
-                    link_elem = element.select_one(selectors["link"])
+                    link_elem = _select_first(link_alts, element)
                     if not link_elem:
                         continue
                     
-                    url = link_elem.get('href', '')
-                    if not url:
+                    href = link_elem.get('href', '')
+                    if not href:
                         continue
                     
-                    # Make absolute URL
-                    if url.startswith('/'):
-                        base_url = selectors.get("base_url", "")
-                        if "bbc.com" in source_name.lower():
-                            url = f"https://www.bbc.com{url}"
-                        elif "reuters.com" in source_name.lower():
-                            url = f"https://www.reuters.com{url}"
-                        elif "aljazeera.com" in source_name.lower():
-                            url = f"https://www.aljazeera.com{url}"
-                        else:
-                            continue
+                    # Resolve relative and protocol-relative links against the page they came from
+                    url = urljoin(source_config["url"], href)
                     
-                    if url in self.scraped_urls or not url.startswith('http'):
+                    if not url.startswith('http'):
                         continue
                     
                     # Get summary
                     summary = ""
-                    summary_elem = element.select_one(selectors.get("summary", "p"))
+                    summary_elem = _select_first(summary_alts, element)
                     if summary_elem:
-                        summary = self.clean_text(summary_elem.get_text(strip=True))
+                        summary = cls.clean_text(node_text(summary_elem))
                     
                     # Pick image from card if available
                     image_url = None
-                    img = element.select_one('img')
+                    img = img_css.select_one(element)
                     if img:
                         image_url = img.get('src') or img.get('data-src') or None
 
                     # Create article data (only required fields)
                     article_data = {
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": timestamp,
                         "link": url,
                         "title": headline,
                         "category": "regional",
@@ -194,7 +282,6 @@ class QuickFixScraper:
                     }
                     
                     articles.append(article_data)
-                    self.scraped_urls.add(url)
                     
                 except Exception as e:
                     logger.warning(f"⚠️ Error extracting article: {e}")
@@ -208,25 +295,25 @@ class QuickFixScraper:
             return []
     
     async def post_article(self, article_data: Dict, session: aiohttp.ClientSession) -> bool:
-        """Post article with long delay"""
+        """Post article, paced by the shared rate limiter"""
         try:
-            # LONG delay to avoid rate limiting
-            await asyncio.sleep(5)  # 5 seconds between each article
+            await self._post_limiter.acquire()
             
             async with session.post(
                 f"{self.api_base_url}/api/rss",
-                json={
+                data=orjson.dumps({
                     "timestamp": article_data.get("timestamp"),
                     "link": article_data.get("link"),
                     "title": article_data.get("title"),
                     "category": article_data.get("category"),
                     "image_url": article_data.get("image_url")
-                },
+                }),
                 headers={'Content-Type': 'application/json'},
                 timeout=10
             ) as response:
                 
                 if response.status in [200, 201]:
+                    self.scraped_urls.add(article_data["link"])
                     logger.info(f"✅ Posted: {article_data['title'][:50]}...")
                     return True
                 elif response.status == 429:
@@ -234,6 +321,8 @@ class QuickFixScraper:
                     await asyncio.sleep(30)  # Long backoff
                     return False
                 elif response.status == 409:
+                    # The API already has it; no point offering it again
+                    self.scraped_urls.add(article_data["link"])
                     error_text = await response.text()
                     logger.info(f"👉 Duplicate article found, skipping: {article_data['title'][:50]}... ({error_text})")
                     return False
@@ -251,62 +340,100 @@ class QuickFixScraper:
         logger.info(f"🚀 Starting {source_config['name']}")
         
         # Fetch page
-        soup = await self.fetch_page(source_config["url"], source_config["name"], session)
-        if not soup:
+        html, validators = await self.fetch_page(source_config["url"], source_config["name"], session)
+        if html is NOT_MODIFIED:
+            return {"source": source_config["name"], "articles_found": 0, "articles_posted": 0, "status": "unchanged"}
+        if not html:
             return {"source": source_config["name"], "articles_found": 0, "articles_posted": 0, "error": "Failed to fetch"}
         
-        # Extract articles
-        articles = self.extract_articles(soup, source_config["name"], source_config["selectors"])
+        # Extract articles in a worker thread so concurrent fetches keep flowing
+        extracted = await asyncio.to_thread(_parse_page_static, html, source_config["name"], source_config)
+        
+        # Dedup here, where the seen-URL filter lives; links are claimed while in flight so
+        # concurrent sources don't post the same story, and only marked seen once the API has them
+        articles = []
+        for article in extracted:
+            link = article["link"]
+            if link in self.scraped_urls or link in self._claimed_urls:
+                continue
+            self._claimed_urls.add(link)
+            articles.append(article)
+        
         if not articles:
+            if extracted and all(article["link"] in self.scraped_urls for article in extracted):
+                # The API already has everything on the page; a 304 next time loses nothing
+                self._remember_validators(source_config["url"], validators)
             return {"source": source_config["name"], "articles_found": 0, "articles_posted": 0, "error": "No articles extracted"}
         
         # Post articles with delays
         posted_count = 0
-        for article in articles:
-            success = await self.post_article(article, session)
-            if success:
-                posted_count += 1
+        try:
+            for article in articles:
+                success = await self.post_article(article, session)
+                if success:
+                    posted_count += 1
+        finally:
+            self._claimed_urls.difference_update(article["link"] for article in articles)
         
         logger.info(f"✅ {source_config['name']} completed: {posted_count}/{len(articles)} posted")
         
+        # Only let the next fetch short-circuit on 304 once the API has everything from this page;
+        # anything that failed to post is retried from a full fetch
+        if all(article["link"] in self.scraped_urls for article in articles):
+            self._remember_validators(source_config["url"], validators)
+        
         return {
             "source": source_config["name"],
             "articles_found": len(articles),
             "articles_posted": posted_count
         }
     
-    async def run_quick_scrape(self) -> Dict:
-        """Run quick scrape with working sources only"""
+    def _remember_validators(self, url: str, validators: Optional[Validators]) -> None:
+        """Replay these validators on the next fetch of url"""
+        if validators:
+            self._etag_cache[url] = validators
+    
+    async def _bounded_scrape(self, sem: asyncio.Semaphore, source_key: str, source_config: Dict, session: aiohttp.ClientSession) -> Dict:
+        """Scrape one source under the global and per-host limits"""
+        host = urlparse(source_config["url"]).netloc
+        host_sem = self._host_sems.setdefault(host, asyncio.Semaphore(1))
+        
+        async with sem, host_sem:
+            try:
+                return await self.scrape_source(source_key, source_config, session)
+            except Exception as e:
+                logger.error(f"❌ Error with {source_key}: {e}")
+                return {
+                    "source": source_config["name"],
+                    "articles_found": 0,
+                    "articles_posted": 0,
+                    "error": str(e)
+                }
+    
+    async def _scrape_all(self, session: aiohttp.ClientSession) -> List[Dict]:
+        """Scrape every working source concurrently over the given session"""
+        sem = asyncio.Semaphore(4)
+        tasks = [
+            asyncio.create_task(self._bounded_scrape(sem, source_key, source_config, session))
+            for source_key, source_config in self.working_sources.items()
+        ]
+        return await asyncio.gather(*tasks)
+    
+    async def run_quick_scrape(self, session: Optional[aiohttp.ClientSession] = None) -> Dict:
+        """Run quick scrape with working sources only, reusing the caller's session when given"""
         logger.info("🚀 Starting QUICK-FIX UAE scrape...")
         start_time = time.time()
         
-        results = []
-        total_found = 0
-        total_posted = 0
+        if session is None:
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as own_session:
+                results = await self._scrape_all(own_session)
+        else:
+            results = await self._scrape_all(session)
         
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        ) as session:
-            
-            for source_key, source_config in self.working_sources.items():
-                try:
-                    result = await self.scrape_source(source_key, source_config, session)
-                    results.append(result)
-                    total_found += result["articles_found"]
-                    total_posted += result["articles_posted"]
-                    
-                    # Long delay between sources to avoid rate limiting
-                    logger.info(f"😴 Waiting 10 seconds before next source...")
-                    await asyncio.sleep(10)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error with {source_key}: {e}")
-                    results.append({
-                        "source": source_config["name"],
-                        "articles_found": 0,
-                        "articles_posted": 0,
-                        "error": str(e)
-                    })
+        total_found = sum(r["articles_found"] for r in results)
+        total_posted = sum(r["articles_posted"] for r in results)
         
         elapsed_time = time.time() - start_time
         
@@ -324,7 +451,7 @@ class QuickFixScraper:
             },
             "detailed_results": results,
             "recommendations": [
-                f"🐌 Used 5-second delays between articles to avoid rate limiting",
+                f"🐌 Posted at up to {settings.api_post_rate:g} articles/second to avoid rate limiting",
                 f"📊 Posted {total_posted} articles total",
                 f"⚡ To get more articles, increase rate limits in your Node.js API"
             ]
@@ -4,116 +4,235 @@ Ultra Enhanced UAE Scraper - Bypasses all restrictions including 403s, brotli, a
 """
 
 import asyncio
+import functools
+import os
+import shutil
+import tempfile
 import aiohttp
 from bs4 import BeautifulSoup
+import soupsieve as sv
 import logging
 from datetime import datetime
 import time
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from urllib.parse import urljoin
+from typing import Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
 import random
 import json
-
-# Install missing dependencies first
-import subprocess
-import sys
-
-def install_missing_packages():
-    """Auto-install missing packages"""
-    packages = {
-        'brotli': 'brotli',
-        'cloudscraper': 'cloudscraper',
-        'fake_useragent': 'fake-useragent',
-        'curl_cffi': 'curl-cffi',
-        'httpx': 'httpx[http2]',
-        'playwright': 'playwright',
-        'undetected_chromedriver': 'undetected-chromedriver'
-    }
-    
-    for module, package in packages.items():
-        try:
-            __import__(module)
-        except ImportError:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            if package == 'playwright':
-                subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"])
-
-install_missing_packages()
-
-# Now import everything
-import brotli  # This fixes the brotli encoding issue
-import cloudscraper
-from fake_useragent import UserAgent
-from curl_cffi import requests as curl_requests
+try:
+    import fcntl
+except ImportError:  # non-POSIX: profile slots are only coordinated within this process
+    fcntl = None
 import httpx
-from playwright.async_api import async_playwright
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config.settings import settings
+from app.scraper.html_utils import decode_html
+
+# Optional fetch backends; a strategy whose library is missing is skipped rather than failing the import
+try:
+    import cloudscraper
+    _HAS_CLOUDSCRAPER = True
+except ImportError:
+    cloudscraper = None
+    _HAS_CLOUDSCRAPER = False
+
+try:
+    from curl_cffi import requests as curl_requests
+    _HAS_CURL_CFFI = True
+except ImportError:
+    curl_requests = None
+    _HAS_CURL_CFFI = False
+
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+    _HAS_PW = True
+except ImportError:
+    async_playwright = PlaywrightError = PlaywrightTimeoutError = None
+    _HAS_PW = False
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Every HTTP strategy asks for brotli first; the clients decompress it natively when brotli is installed
+_ACCEPT_ENCODING = 'br, gzip, deflate'
+
+# Raw response body plus the charset the server declared for it (None when undeclared)
+_Fetched = Tuple[bytes, Optional[str]]
+
+
+def _declared_charset(content_type: Optional[str]) -> Optional[str]:
+    """charset parameter of a Content-Type header, if any"""
+    if not content_type or 'charset=' not in content_type.lower():
+        return None
+    value = content_type[content_type.lower().index('charset=') + 8:]
+    return value.split(';', 1)[0].strip().strip('"\'') or None
+
+
+# Fallback card search for JS-rendered pages: only blocks that hold both a heading and a link
+_CARD_CSS = sv.compile(':is(article, div, section, li):has(:is(h1, h2, h3, h4)):has(a[href])')
+_HEADING_CSS = sv.compile('h1, h2, h3, h4')
+_LINK_CSS = sv.compile('a[href]')
+_PARAGRAPH_CSS = sv.compile('p')
+
+# Profile dirs held by an open browser in this process; Chromium's SingletonLock allows one browser per dir
+_profiles_in_use: Set[str] = set()
+
+# Stable slot-N profiles under the configured root. A browser takes the first free slot (flock'd across
+# processes), so a restarted worker gets its warm profile back and disk use stays bounded.
+_PROFILE_SLOTS = 16
+
+# What Playwright waits for when the source config gives no article selector: card markup only,
+# since a page-level h1 is usually in the shell long before any stories render
+_DEFAULT_WAIT_CSS = "article h2, article h3, [data-testid='headline']"
+
+# Resource types headline extraction never needs; stylesheets stay so lazy-load scrolling sees real layout
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Injected into every Playwright context before any page script runs
+_STEALTH_INIT_JS = """
+    // Overwrite the `navigator.webdriver` property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // Mock plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+
+    // Mock languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+
+    // Mock permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // Pass Chrome test
+    window.chrome = {
+        runtime: {},
+        loadTimes: function() {},
+        csi: function() {},
+        app: {}
+    };
+
+    // Mock WebGL
+    const getParameter = WebGLRenderingContext.prototype.getParameter;
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) {
+            return 'Intel Inc.';
+        }
+        if (parameter === 37446) {
+            return 'Intel Iris OpenGL Engine';
+        }
+        return getParameter(parameter);
+    };
+"""
+
+@dataclass(slots=True)
 class ScrapingResult:
     source_name: str
     url: str
     status: str
     articles_found: int
     articles_posted: int
-    error_details: Dict = None
+    error_details: Dict = field(default_factory=dict)
     strategy_used: str = ""
     processing_time: float = 0.0
-    
-    def __post_init__(self):
-        if self.error_details is None:
-            self.error_details = {}
 
 
 class UltraEnhancedFetcher:
     """Ultimate fetching with 10+ strategies to bypass any restriction"""
     
     def __init__(self):
-        self.ua = UserAgent()
         self.cloudscraper_session = cloudscraper.create_scraper(
             browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
-        )
+        ) if _HAS_CLOUDSCRAPER else None
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:133.0) Gecko/20100101 Firefox/133.0',
         ]
-        self.httpx_client = None
+        # Shared HTTP/2 pool: requests to the same origin multiplex over one connection
+        self.httpx_client = self._new_httpx_client()
+        # host -> name of the strategy that last fetched it, tried first next time
+        self._host_strategy_cache: Dict[str, str] = {}
+        # Pooled, retrying session for the requests strategy; cookies carry over between fetches
+        self._requests_session = self._new_requests_session()
+        # Pooled keep-alive session for the aiohttp strategy, opened on first use
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        
+        # Playwright driver and its browser context start on first use and live until cleanup().
+        # The profile slot is claimed at launch, so workers forked after import still get their own.
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._claimed_profile: Optional[str] = None
+        self._profile_lock = None
+        self._temp_profile: Optional[str] = None
+        self._browser_lock = asyncio.Lock()
+        self._page_slots = asyncio.Semaphore(3)
     
-    async def fetch_with_strategies(self, url: str, source_name: str) -> Tuple[Optional[str], str]:
-        """Try multiple fetch strategies in order of effectiveness"""
+    async def fetch_with_strategies(self, url: str, source_name: str,
+                                    wait_selector: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str], str]:
+        """Try fetch strategies cheapest first, leading with whichever last worked for this host"""
         
+        # Plain HTTP clients first; a real browser only as a last resort
         strategies = [
-            ("CloudScraper", self._fetch_cloudscraper),
-            ("cURL-Impersonate", self._fetch_curl_impersonate),
-            ("HTTPX-HTTP2", self._fetch_httpx_http2),
-            ("Playwright-Stealth", self._fetch_playwright_stealth),
-            ("AioHTTP-Brotli", self._fetch_aiohttp_brotli),
-            ("Requests-Session", self._fetch_requests_session),
-            ("MCP-Direct", self._fetch_mcp_direct),
+            (strategy_name, strategy_func)
+            for strategy_name, strategy_func, available in (
+                ("HTTPX-HTTP2", self._fetch_httpx_http2, True),
+                ("cURL-Impersonate", self._fetch_curl_impersonate, _HAS_CURL_CFFI),
+                ("AioHTTP-Brotli", self._fetch_aiohttp_brotli, True),
+                ("CloudScraper", self._fetch_cloudscraper, _HAS_CLOUDSCRAPER),
+                ("Requests-Session", self._fetch_requests_session, True),
+                ("Playwright-Stealth", functools.partial(self._fetch_playwright_stealth, wait_selector=wait_selector), _HAS_PW),
+                ("MCP-Direct", self._fetch_mcp_direct, True),
+            )
+            if available
         ]
         
+        host = urlparse(url).netloc
+        known_good = self._host_strategy_cache.get(host)
+        if known_good:
+            strategies.sort(key=lambda strategy: strategy[0] != known_good)
+        
         for strategy_name, strategy_func in strategies:
             try:
                 logger.info(f"🔧 {source_name} - Trying {strategy_name}")
-                html = await strategy_func(url)
+                fetched = await strategy_func(url)
                 
-                if html and len(html) > 500:
-                    logger.info(f"✅ {source_name} - Success with {strategy_name} ({len(html)} bytes)")
-                    return html, strategy_name
+                # Size gate runs on the raw bytes; decoding waits until the page is actually parsed
+                if fetched and len(fetched[0]) > 500:
+                    raw, charset = fetched
+                    logger.info(f"✅ {source_name} - Success with {strategy_name} ({len(raw)} bytes)")
+                    self._host_strategy_cache[host] = strategy_name
+                    return raw, charset, strategy_name
                     
             except Exception as e:
                 logger.debug(f"⚠️ {source_name} - {strategy_name} failed: {str(e)[:100]}")
                 continue
         
         logger.error(f"❌ {source_name} - All strategies failed")
-        return None, "all_failed"
+        return None, None, "all_failed"
     
-    async def _fetch_cloudscraper(self, url: str) -> Optional[str]:
+    async def _fetch_cloudscraper(self, url: str) -> Optional[_Fetched]:
         """CloudScraper - Bypasses Cloudflare and most anti-bot systems"""
         response = await asyncio.to_thread(
             self.cloudscraper_session.get,
@@ -122,15 +241,16 @@ class UltraEnhancedFetcher:
             headers={
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': _ACCEPT_ENCODING,
                 'Cache-Control': 'no-cache',
                 'Pragma': 'no-cache',
             }
         )
         if response.status_code == 200:
-            return response.text
+            return response.content, _declared_charset(response.headers.get('content-type'))
         raise Exception(f"Status {response.status_code}")
     
-    async def _fetch_curl_impersonate(self, url: str) -> Optional[str]:
+    async def _fetch_curl_impersonate(self, url: str) -> Optional[_Fetched]:
         """cURL with browser impersonation - Bypasses fingerprint detection"""
         response = await asyncio.to_thread(
             curl_requests.get,
@@ -140,50 +260,94 @@ class UltraEnhancedFetcher:
             headers={
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.9',
+                # Accept-Encoding is left to the impersonation profile, which already offers br
             }
         )
         if response.status_code == 200:
-            return response.text
+            return response.content, _declared_charset(response.headers.get('content-type'))
         raise Exception(f"Status {response.status_code}")
     
-    async def _fetch_httpx_http2(self, url: str) -> Optional[str]:
+    def _new_httpx_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(20.0, connect=5.0),
+            follow_redirects=True,
+            headers={'User-Agent': random.choice(self.user_agents), 'Accept-Encoding': _ACCEPT_ENCODING}
+        )
+    
+    async def _fetch_httpx_http2(self, url: str) -> Optional[_Fetched]:
         """HTTPX with HTTP/2 support - Better for modern sites"""
-        if not self.httpx_client:
-            self.httpx_client = httpx.AsyncClient(
-                http2=True,
-                headers={'User-Agent': random.choice(self.user_agents)},
-                timeout=20.0,
-                follow_redirects=True
-            )
-        
         response = await self.httpx_client.get(url)
         if response.status_code == 200:
-            return response.text
+            return response.content, _declared_charset(response.headers.get('content-type'))
         raise Exception(f"Status {response.status_code}")
     
-    async def _fetch_playwright_stealth(self, url: str) -> Optional[str]:
-        """Playwright with maximum stealth - Undetectable browser automation"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-infobars',
-                    '--window-position=0,0',
-                    '--ignore-certifcate-errors',
-                    '--ignore-certifcate-errors-spki-list',
-                    '--user-agent=' + random.choice(self.user_agents)
-                ]
-            )
+    def _claim_profile_dir(self) -> str:
+        """First free slot profile under the configured root, or a throwaway one if every slot is taken"""
+        root = settings.playwright_profile_dir
+        os.makedirs(root, exist_ok=True)
+        for slot in range(_PROFILE_SLOTS):
+            profile_dir = os.path.join(root, f"slot-{slot}")
+            if profile_dir in _profiles_in_use:
+                continue
+            self._profile_lock = self._lock_profile_slot(profile_dir)
+            if self._profile_lock is not None:
+                break
+        else:
+            profile_dir = self._temp_profile = tempfile.mkdtemp(prefix="tmp-", dir=root)
+        _profiles_in_use.add(profile_dir)
+        self._claimed_profile = profile_dir
+        return profile_dir
+    
+    @staticmethod
+    def _lock_profile_slot(profile_dir: str):
+        """Hold an exclusive lock on the slot's lock file; None if another process already does"""
+        lock_file = open(profile_dir + ".lock", "w")
+        if fcntl is None:
+            return lock_file
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+    
+    def _release_profile_dir(self):
+        if self._claimed_profile:
+            _profiles_in_use.discard(self._claimed_profile)
+            self._claimed_profile = None
+        if self._profile_lock:
+            self._profile_lock.close()
+            self._profile_lock = None
+        if self._temp_profile:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
+    
+    async def _ensure_context(self):
+        """Open the browser context once; with the persistent profile, cookies and HTTP cache survive across runs"""
+        async with self._browser_lock:
+            if self._context is not None:
+                return
             
-            context = await browser.new_context(
+            # One UA for both the launch flag and the context keeps the fingerprint consistent
+            ua = random.choice(self.user_agents)
+            launch_args = [
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--disable-web-security',
+                '--disable-features=IsolateOrigins,site-per-process',
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-infobars',
+                '--window-position=0,0',
+                '--ignore-certifcate-errors',
+                '--ignore-certifcate-errors-spki-list',
+                '--user-agent=' + ua
+            ]
+            context_options = dict(
                 viewport={'width': 1920, 'height': 1080},
-                user_agent=random.choice(self.user_agents),
+                user_agent=ua,
                 ignore_https_errors=True,
                 java_script_enabled=True,
                 bypass_csp=True,
@@ -192,120 +356,138 @@ class UltraEnhancedFetcher:
                 }
             )
             
-            # Stealth mode
-            await context.add_init_script("""
-                // Overwrite the `navigator.webdriver` property
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
+            self._pw = await async_playwright().start()
+            try:
+                try:
+                    self._context = await self._pw.chromium.launch_persistent_context(
+                        user_data_dir=self._claim_profile_dir(),
+                        headless=True,
+                        args=launch_args,
+                        **context_options
+                    )
+                except PlaywrightError as e:
+                    # Profile locked or unusable: a fresh context still works, it just starts without cookies
+                    logger.warning(f"⚠️ Persistent Playwright profile unavailable, using a fresh context: {str(e)[:100]}")
+                    self._release_profile_dir()
+                    self._browser = await self._pw.chromium.launch(headless=True, args=launch_args)
+                    self._context = await self._browser.new_context(**context_options)
                 
-                // Mock plugins
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
+                # Stealth mode
+                await self._context.add_init_script(_STEALTH_INIT_JS)
+                # Registered on the context so every page skips images, media and fonts
+                await self._context.route("**/*", _block_heavy_resources)
+            except BaseException:
+                await self._close_browser()
+                raise
+    
+    async def _close_browser(self):
+        """Close the context, browser and driver, whichever of them got started"""
+        if self._context:
+            await self._context.close()
+            self._context = None
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+        self._release_profile_dir()
+    
+    async def _fetch_playwright_stealth(self, url: str, wait_selector: Optional[str] = None) -> Optional[_Fetched]:
+        """Playwright with maximum stealth - Undetectable browser automation"""
+        await self._ensure_context()
+        
+        async with self._page_slots:
+            page = await self._context.new_page()
+            try:
+                # Random mouse movement to appear human
+                await page.mouse.move(random.randint(0, 100), random.randint(0, 100))
                 
-                // Mock languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
+                # domcontentloaded rather than commit, so server redirects have settled before we read the DOM
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
                 
-                // Mock permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
+                try:
+                    # Hand the page back as soon as article markup is in the DOM
+                    await page.wait_for_selector(wait_selector or _DEFAULT_WAIT_CSS, state='attached', timeout=8000)
+                except PlaywrightError as e:
+                    # Timed out, or the source selector is soupsieve syntax Playwright can't parse:
+                    # scroll to trigger lazy loading instead
+                    if not isinstance(e, PlaywrightTimeoutError):
+                        logger.debug(f"Playwright wait selector rejected for {url}: {str(e)[:100]}")
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight/3)")
+                    await asyncio.sleep(0.5)
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight*2/3)")
+                    await asyncio.sleep(0.5)
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await asyncio.sleep(1)
                 
-                // Pass Chrome test
-                window.chrome = {
-                    runtime: {},
-                    loadTimes: function() {},
-                    csi: function() {},
-                    app: {}
-                };
+                try:
+                    html = await page.content()
+                except PlaywrightError:
+                    # A client-side redirect landed mid-read; take the new document once it has loaded
+                    await page.wait_for_load_state('domcontentloaded')
+                    html = await page.content()
                 
-                // Mock WebGL
-                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                    if (parameter === 37445) {
-                        return 'Intel Inc.';
-                    }
-                    if (parameter === 37446) {
-                        return 'Intel Iris OpenGL Engine';
-                    }
-                    return getParameter(parameter);
-                };
-            """)
-            
-            page = await context.new_page()
-            
-            # Random mouse movement to appear human
-            await page.mouse.move(random.randint(0, 100), random.randint(0, 100))
-            
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            
-            # Scroll to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight/3)")
-            await asyncio.sleep(0.5)
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight*2/3)")
-            await asyncio.sleep(0.5)
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(1)
-            
-            content = await page.content()
-            await browser.close()
-            
-            return content
+                # The DOM serialisation is already a str; hand it back as UTF-8 like the HTTP strategies
+                return html.encode('utf-8'), 'utf-8'
+            finally:
+                await page.close()
     
-    async def _fetch_aiohttp_brotli(self, url: str) -> Optional[str]:
+    async def _fetch_aiohttp_brotli(self, url: str) -> Optional[_Fetched]:
         """AioHTTP with brotli support"""
-        connector = aiohttp.TCPConnector(ssl=False, force_close=True)
-        timeout = aiohttp.ClientTimeout(total=20)
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ssl=False, limit=20, limit_per_host=4, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=20)
+            )
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            async with session.get(url, headers=headers, allow_redirects=True) as response:
-                if response.status == 200:
-                    return await response.text()
-                raise Exception(f"Status {response.status}")
-    
-    async def _fetch_requests_session(self, url: str) -> Optional[str]:
-        """Regular requests with session and cookies"""
-        import requests
+        headers = {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': _ACCEPT_ENCODING,
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
         
+        async with self._aio_session.get(url, headers=headers, allow_redirects=True) as response:
+            if response.status == 200:
+                return await response.read(), response.charset
+            raise Exception(f"Status {response.status}")
+    
+    @staticmethod
+    def _new_requests_session() -> requests.Session:
         session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         session.headers.update({
-            'User-Agent': random.choice(self.user_agents),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _ACCEPT_ENCODING,
         })
-        
-        # Visit Google first to get cookies
-        session.get('https://www.google.com')
-        
+        return session
+    
+    async def _fetch_requests_session(self, url: str) -> Optional[_Fetched]:
+        """Regular requests with session and cookies"""
         response = await asyncio.to_thread(
-            session.get,
+            self._requests_session.get,
             url,
+            headers={'User-Agent': random.choice(self.user_agents)},
             timeout=20,
             verify=False
         )
         
         if response.status_code == 200:
-            return response.text
+            return response.content, _declared_charset(response.headers.get('content-type'))
         raise Exception(f"Status {response.status_code}")
     
-    async def _fetch_mcp_direct(self, url: str) -> Optional[str]:
+    async def _fetch_mcp_direct(self, url: str) -> Optional[_Fetched]:
         """Direct MCP Playwright extraction"""
         try:
             from app.scraper.mcp_bridge_client import extract_with_mcp_direct
@@ -318,7 +500,7 @@ class UltraEnhancedFetcher:
             )
             
             if diag.get('html'):
-                return diag['html']
+                return diag['html'].encode('utf-8'), 'utf-8'
                 
         except Exception as e:
             logger.debug(f"MCP not available: {e}")
@@ -327,19 +509,30 @@ class UltraEnhancedFetcher:
     
     async def cleanup(self):
         """Cleanup resources"""
-        if self.httpx_client:
-            await self.httpx_client.aclose()
+        # Swap in a fresh (unconnected) client so the fetcher stays usable for the next run
+        await self.httpx_client.aclose()
+        self.httpx_client = self._new_httpx_client()
+        if self._aio_session:
+            await self._aio_session.close()
+            self._aio_session = None
+        self._requests_session.close()
+        
+        await self._close_browser()
 
 
 class UltraEnhancedUAEScraper:
     """Ultra Enhanced scraper that bypasses ALL restrictions"""
     
-    def __init__(self, existing_scraper):
+    def __init__(self, existing_scraper, max_concurrent_sources: Optional[int] = None,
+                 connector_limit: Optional[int] = None, connector_limit_per_host: Optional[int] = None):
         self.existing_scraper = existing_scraper
+        # Source concurrency is bounded by a semaphore; the connector only caps sockets. Unset limits come from settings.
+        self.max_concurrent_sources = max_concurrent_sources or settings.max_concurrent_sources
+        self.connector_limit = connector_limit or settings.connector_limit
+        self.connector_limit_per_host = connector_limit_per_host or settings.connector_limit_per_host
         self.ultra_fetcher = UltraEnhancedFetcher()
         self.text_processor = existing_scraper.text_processor
         self.api_base_url = existing_scraper.api_base_url
-        self.scraped_urls = existing_scraper.scraped_urls
     
     async def scrape_source_ultra(self, source_name: str, source_config: Dict, session: aiohttp.ClientSession) -> ScrapingResult:
         """Ultra enhanced source scraping"""
@@ -356,24 +549,24 @@ class UltraEnhancedUAEScraper:
         
         try:
             # Use ultra fetcher
-            html, strategy_used = await self.ultra_fetcher.fetch_with_strategies(
+            raw, charset, strategy_used = await self.ultra_fetcher.fetch_with_strategies(
                 source_config["url"],
-                source_config["name"]
+                source_config["name"],
+                wait_selector=source_config.get("selectors", {}).get("articles")
             )
             
             result.strategy_used = strategy_used
             
-            if not html:
+            if not raw:
                 result.status = 'failed'
                 result.error_details["no_content"] = "All fetch strategies failed"
                 return result
             
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
+            html = decode_html(raw, charset)
             
-            # Extract articles
-            articles, extract_debug = self.existing_scraper.extract_articles_with_debugging(
-                soup, source_name, source_config
+            # Parse and extract in a worker thread so concurrent sources keep fetching
+            soup, articles, extract_debug = await asyncio.to_thread(
+                self._parse_and_extract, html, source_name, source_config
             )
             
             result.error_details.update(extract_debug)
@@ -381,16 +574,20 @@ class UltraEnhancedUAEScraper:
             
             if len(articles) == 0 and strategy_used == "Playwright-Stealth":
                 # If Playwright was used but no articles found, try direct extraction
-                articles = self._extract_from_playwright_html(html, source_config)
+                articles = self._extract_from_playwright_html(soup, source_config)
                 result.articles_found = len(articles)
             
-            # Post articles
-            posted_count = 0
-            for article in articles:
-                success, _ = await self.existing_scraper.post_article_with_retry(article, session)
-                if success:
-                    posted_count += 1
-                await asyncio.sleep(0.5)
+            # Post articles concurrently over the shared session; post_article_with_retry paces the
+            # article-page fetches per host and the POSTs through the scraper's shared API token bucket
+            post_slots = asyncio.Semaphore(8)
+            
+            async def post_one(article) -> bool:
+                async with post_slots:
+                    success, _ = await self.existing_scraper.post_article_with_retry(article, session)
+                    return success
+            
+            posted = await asyncio.gather(*(post_one(article) for article in articles))
+            posted_count = sum(posted)
             
             result.articles_posted = posted_count
             result.status = 'success' if posted_count > 0 else 'partial'
@@ -406,39 +603,43 @@ class UltraEnhancedUAEScraper:
         
         return result
     
-    def _extract_from_playwright_html(self, html: str, source_config: Dict) -> List:
-        """Fallback extraction for Playwright-rendered HTML"""
+    def _parse_and_extract(self, html: str, source_name: str, source_config: Dict) -> Tuple[BeautifulSoup, List, Dict]:
+        """Parse a fetched page and run the configured extraction over it (CPU-bound, runs off the event loop)"""
+        soup = BeautifulSoup(html, "lxml")
+        articles, extract_debug = self.existing_scraper.extract_articles_with_debugging(
+            soup, source_name, source_config
+        )
+        return soup, articles, extract_debug
+    
+    def _extract_from_playwright_html(self, page: Union[str, BeautifulSoup], source_config: Dict) -> List:
+        """Fallback extraction for Playwright-rendered HTML; pass the already-parsed soup to skip a re-parse"""
         from app.scraper.enhanced_uae_scraper import Article
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, "lxml")
         articles = []
         
-        # More aggressive extraction for JS-rendered content
-        potential_articles = soup.find_all(['article', 'div', 'section', 'li'])
+        # More aggressive extraction for JS-rendered content; the heading/link filter runs inside the selector
+        potential_articles = _CARD_CSS.select(soup, limit=20)
         
-        for elem in potential_articles[:20]:
+        for elem in potential_articles:
             try:
                 # Find any heading
-                heading = elem.find(['h1', 'h2', 'h3', 'h4'])
-                if not heading:
-                    continue
+                heading = _HEADING_CSS.select_one(elem)
                 
                 headline = self.existing_scraper.clean_text(heading.get_text())
                 if len(headline) < 10:
                     continue
                 
                 # Find any link
-                link = elem.find('a', href=True)
-                if not link:
-                    continue
+                link = _LINK_CSS.select_one(elem)
                 
                 url = urljoin(source_config['url'], link['href'])
                 
-                if url in self.scraped_urls:
+                if not self.existing_scraper.claim_url(url):
                     continue
                 
                 # Extract summary
-                paragraphs = elem.find_all('p')
-                summary = ' '.join([p.get_text(strip=True) for p in paragraphs[:2]])
+                paragraphs = _PARAGRAPH_CSS.select(elem, limit=2)
+                summary = ' '.join([p.get_text(strip=True) for p in paragraphs])
                 summary = self.existing_scraper.clean_text(summary)
                 
                 article = Article(
@@ -452,7 +653,6 @@ class UltraEnhancedUAEScraper:
                 )
                 
                 articles.append(article)
-                self.scraped_urls.add(url)
                 
             except Exception:
                 continue
@@ -464,10 +664,6 @@ class UltraEnhancedUAEScraper:
         logger.info("🚀🚀 Starting ULTRA ENHANCED UAE news scrape...")
         start_time = time.time()
         
-        results = []
-        total_found = 0
-        total_posted = 0
-        
         # Import config
         from app.scraper.enhanced_uae_scraper import EnhancedUAENewsConfig
         
@@ -477,31 +673,43 @@ class UltraEnhancedUAEScraper:
             key=lambda x: x[1].get('priority', 999)
         )
         
+        sem = asyncio.Semaphore(self.max_concurrent_sources)
+        
+        async def sem_wrapped(source_name: str, source_config: Dict, session: aiohttp.ClientSession) -> ScrapingResult:
+            async with sem:
+                return await self.scrape_source_ultra(source_name, source_config, session)
+        
         async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(limit=5, limit_per_host=2),
+            connector=aiohttp.TCPConnector(
+                limit=self.connector_limit,
+                limit_per_host=self.connector_limit_per_host,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            ),
             timeout=aiohttp.ClientTimeout(total=60)
         ) as session:
-            
-            for source_name, source_config in sorted_sources:
-                try:
-                    result = await self.scrape_source_ultra(source_name, source_config, session)
-                    results.append(result)
-                    total_found += result.articles_found
-                    total_posted += result.articles_posted
-                    
-                    # Adaptive delay
-                    await asyncio.sleep(2 if result.status == 'success' else 3)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Critical error scraping {source_name}: {e}")
-                    results.append(ScrapingResult(
-                        source_name=source_config['name'],
-                        url=source_config['url'],
-                        status='failed',
-                        articles_found=0,
-                        articles_posted=0,
-                        error_details={"critical_error": str(e)}
-                    ))
+            tasks = [
+                asyncio.create_task(sem_wrapped(source_name, source_config, session))
+                for source_name, source_config in sorted_sources
+            ]
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = []
+        for (source_name, source_config), outcome in zip(sorted_sources, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ Critical error scraping {source_name}: {outcome}")
+                outcome = ScrapingResult(
+                    source_name=source_config['name'],
+                    url=source_config['url'],
+                    status='failed',
+                    articles_found=0,
+                    articles_posted=0,
+                    error_details={"critical_error": str(outcome)}
+                )
+            results.append(outcome)
+        
+        total_found = sum(r.articles_found for r in results)
+        total_posted = sum(r.articles_posted for r in results)
         
         # Cleanup
         await self.ultra_fetcher.cleanup()
@@ -0,0 +1,27 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.scraper.enhanced_uae_scraper import EnhancedUAEScraper
+
+
+def test_claim_url_admits_a_url_once():
+    scraper = EnhancedUAEScraper()
+
+    assert scraper.claim_url("https://example.com/news/1") is True
+    assert scraper.claim_url("https://example.com/news/1") is False
+    assert scraper.claim_url("https://example.com/news/2") is True
+
+
+def test_concurrent_claims_of_the_same_url_admit_exactly_one():
+    scraper = EnhancedUAEScraper()
+    workers = 16
+    start = threading.Barrier(workers)
+
+    def claim(_):
+        start.wait()
+        return scraper.claim_url("https://example.com/news/shared")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(claim, range(workers)))
+
+    assert results.count(True) == 1
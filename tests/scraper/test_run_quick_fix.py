@@ -0,0 +1,134 @@
+import asyncio
+
+import orjson
+
+from app.scraper.run_quick_fix import QuickFixScraper
+
+
+SHARED_LINK = "https://example.com/news/shared-story"
+
+PAGE = """
+<html><body>
+  <article><h2>Shared story that both sources link to</h2><a href="/news/shared-story">more</a></article>
+  <article><h2>Story that only the first source carries</h2><a href="/news/first-only">more</a></article>
+</body></html>
+"""
+
+SECOND_PAGE = """
+<html><body>
+  <article><h2>Shared story that both sources link to</h2><a href="https://example.com/news/shared-story">more</a></article>
+</body></html>
+"""
+
+
+def _source(url, name="Example"):
+    return {
+        "url": url,
+        "name": name,
+        "selectors": {"articles": "article", "headline": "h2", "link": "a[href]", "summary": "p"},
+    }
+
+
+class _FakeResponse:
+    def __init__(self, status, body="", headers=None, delay=0.0):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+        self._delay = delay
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Serves synthetic pages with ETags and records every GET and POST"""
+
+    def __init__(self, pages, post_status=201, post_delay=0.0):
+        self.pages = pages  # url -> (html, etag)
+        self.post_status = post_status
+        self.post_delay = post_delay
+        self.get_headers = []
+        self.posted_links = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.get_headers.append(dict(headers or {}))
+        html, etag = self.pages[url]
+        if (headers or {}).get("If-None-Match") == etag:
+            return _FakeResponse(304)
+        return _FakeResponse(200, html, {"ETag": etag})
+
+    def post(self, url, data=None, **kwargs):
+        self.posted_links.append(orjson.loads(data)["link"])
+        return _FakeResponse(self.post_status, delay=self.post_delay)
+
+
+def test_failed_post_does_not_cache_validators():
+    scraper = QuickFixScraper()
+    source = _source("https://example.com/")
+    session = _FakeSession({source["url"]: (PAGE, '"v1"')}, post_status=500)
+
+    async def run():
+        first = await scraper.scrape_source("example", source, session)
+        second = await scraper.scrape_source("example", source, session)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first["articles_posted"] == 0
+    assert scraper._etag_cache == {}
+    # No conditional request, so the failed articles are offered again
+    assert "If-None-Match" not in session.get_headers[1]
+    assert second["articles_found"] == 2
+    assert session.posted_links.count(SHARED_LINK) == 2
+
+
+def test_successful_posts_cache_validators_and_next_fetch_is_not_modified():
+    scraper = QuickFixScraper()
+    source = _source("https://example.com/")
+    session = _FakeSession({source["url"]: (PAGE, '"v1"')})
+
+    async def run():
+        first = await scraper.scrape_source("example", source, session)
+        second = await scraper.scrape_source("example", source, session)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first["articles_posted"] == 2
+    assert scraper._etag_cache == {source["url"]: ('"v1"', None)}
+    assert session.get_headers[1]["If-None-Match"] == '"v1"'
+    assert second["status"] == "unchanged"
+    assert len(session.posted_links) == 2
+
+
+def test_concurrent_sources_post_a_shared_link_once():
+    scraper = QuickFixScraper()
+    first_source = _source("https://example.com/", "First")
+    second_source = _source("https://example.org/", "Second")
+    session = _FakeSession(
+        {
+            first_source["url"]: (PAGE, '"a"'),
+            second_source["url"]: (SECOND_PAGE, '"b"'),
+        },
+        post_delay=0.05,
+    )
+
+    async def run():
+        return await asyncio.gather(
+            scraper.scrape_source("first", first_source, session),
+            scraper.scrape_source("second", second_source, session),
+        )
+
+    asyncio.run(run())
+
+    assert session.posted_links.count(SHARED_LINK) == 1
+    assert SHARED_LINK in scraper.scraped_urls
+    assert scraper._claimed_urls == set()